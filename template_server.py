@@ -5,32 +5,64 @@ FastAPI 模板服务模拟器
 
 启动命令: python template_server.py
 默认端口: 8000
+运行环境: Python >= 3.10（数据模型使用了 dataclass 的 slots/kw_only 参数）
+依赖安装: pip install fastapi "uvicorn[standard]" orjson
+          （uvicorn[standard] 附带 uvloop 和 httptools，安装后自动启用）
+          使用 Redis 存储时另需: pip install redis
+
+也可使用 granian 运行（应用代码无需改动，多进程时同样需要配置 REDIS_URL）:
+    pip install granian
+    PROD=1 granian --interface asgi --port 8000 template_server:app
+
+环境变量:
+    PROD=1          生产/压测模式，关闭逐请求的访问日志和 API 文档，
+                    日志级别降为 warning，默认不启用 CORS
+    ENABLE_CORS=0|1 是否启用 CORS 中间件，非 PROD 模式下默认启用
+    MOCK_CHAOS=1    启用故障模拟：每个请求随机延迟 50-500ms，
+                    模板列表接口 10% 概率返回 500；也可由客户端携带
+                    请求头 X-Simulate-Chaos: 1 对单个请求启用
+    WORKERS=N       uvicorn 工作进程数，设为 0 表示使用 CPU 核数；
+                    默认 1，配置了 REDIS_URL 时默认使用 CPU 核数
+                    注意：未配置 REDIS_URL 时模板数据保存在进程内存中，
+                    多进程时各进程互不共享
+    REDIS_URL=...   使用 Redis 存储模板数据（如 redis://localhost:6379/0），
+                    多个工作进程共享同一份数据
 """
 
+import asyncio
 import json
+import os
 import random
 import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Annotated, Dict, List, Optional, Tuple
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 # ==================== 数据模型 ====================
 
 
-class Template(BaseModel):
+# 内部数据由服务端自行构造，无需 Pydantic 校验，使用 slots dataclass 降低构造和内存开销；
+# 仅对外部传入的请求体（TemplateUpload）保留 Pydantic 校验
+@dataclass(slots=True, frozen=True)
+class Template:
     """模板数据结构"""
 
-    id: str = Field(..., description="模板ID")
-    name: str = Field(..., description="模板名称")
-    description: str = Field(..., description="模板描述")
-    content: str = Field(..., description="模板内容")
-    category: Optional[str] = Field("general", description="模板分类")
-    created_at: Optional[str] = Field(None, description="创建时间")
-    updated_at: Optional[str] = Field(None, description="更新时间")
+    id: Annotated[str, Field(description="模板ID")]
+    name: Annotated[str, Field(description="模板名称")]
+    description: Annotated[str, Field(description="模板描述")]
+    content: Annotated[str, Field(description="模板内容")]
+    category: Annotated[Optional[str], Field(description="模板分类")] = "general"
+    created_at: Annotated[Optional[str], Field(description="创建时间")] = None
+    updated_at: Annotated[Optional[str], Field(description="更新时间")] = None
 
 
 class TemplateUpload(BaseModel):
@@ -42,13 +74,14 @@ class TemplateUpload(BaseModel):
     content: str = Field(..., description="模板内容")
 
 
-class ApiResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ApiResponse:
     """API 响应格式"""
 
-    success: bool = Field(..., description="请求是否成功")
-    message: str = Field(..., description="响应消息")
-    data: Optional[dict] = Field(None, description="响应数据")
-    timestamp: str = Field(..., description="时间戳")
+    success: Annotated[bool, Field(description="请求是否成功")]
+    message: Annotated[str, Field(description="响应消息")]
+    data: Annotated[Optional[dict], Field(description="响应数据")] = None
+    timestamp: Annotated[str, Field(description="时间戳")]
 
 
 # ==================== 模拟数据 ====================
@@ -117,57 +150,395 @@ def generate_mock_templates() -> List[Template]:
 
 # ==================== FastAPI 应用 ====================
 
+# 生产/压测模式
+PROD = bool(os.getenv("PROD"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时写入初始模板并启动时间戳刷新任务，退出时释放资源"""
+    clock_task = asyncio.create_task(_tick_now_iso())
+    await store.load(generate_mock_templates())
+    yield
+    clock_task.cancel()
+    await store.close()
+
+
 app = FastAPI(
     title="模板服务模拟器",
     description="用于测试 Tauri 编辑器 HTTP 调用的模拟服务",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # 生产/压测模式下不生成 OpenAPI 文档，加快启动并减少内存占用
+    docs_url=None if PROD else "/docs",
+    redoc_url=None if PROD else "/redoc",
+    openapi_url=None if PROD else "/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# 启用 CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # 允许所有来源，生产环境应限制
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# ==================== 模板存储 ====================
+
+
+class MemoryTemplateStore:
+    """进程内模板存储（默认），以模板ID为键，另按分类建立索引"""
+
+    def __init__(self):
+        self.index: Dict[str, Template] = {}
+        self.by_category: Dict[Optional[str], Dict[str, Template]] = {}
+        # 搜索语料：模板ID -> 预先小写化的 名称\x00描述\x00分类
+        self.search_corpus: Dict[str, str] = {}
+        # 预序列化缓存：模板ID -> JSON 字节，模板写入后内容不再变化
+        self.json_cache: Dict[str, bytes] = {}
+        # 数据版本号，每次写入或删除后递增
+        self._version = 0
+
+    async def load(self, templates: List[Template]) -> None:
+        """写入初始模板"""
+        for template in templates:
+            self._add(template)
+
+    async def close(self) -> None:
+        pass
+
+    async def count(self) -> int:
+        return len(self.index)
+
+    async def version(self) -> int:
+        return self._version
+
+    async def get_json(self, template_id: str) -> Optional[bytes]:
+        return self.json_cache.get(template_id)
+
+    async def list_json(
+        self, category: Optional[str], skip: int, limit: int
+    ) -> List[bytes]:
+        # 按分类过滤并分页，不复制整个列表
+        source = self.by_category.get(category, {}) if category else self.index
+        ids = islice(source, skip, skip + limit)
+        return [self.json_cache[template_id] for template_id in ids]
+
+    async def search_json(self, q_lower: str, skip: int, limit: int) -> List[bytes]:
+        ids = [tid for tid, text in self.search_corpus.items() if q_lower in text]
+        return [self.json_cache[tid] for tid in ids[skip : skip + limit]]
+
+    async def add(self, template: Template) -> bool:
+        """写入模板，ID 已存在时返回 False"""
+        if template.id in self.index:
+            return False
+        self._add(template)
+        return True
+
+    async def remove(self, template_id: str) -> bool:
+        """移除模板，不存在时返回 False"""
+        template = self.index.pop(template_id, None)
+        if template is None:
+            return False
+        category_index = self.by_category[template.category]
+        del category_index[template_id]
+        if not category_index:
+            del self.by_category[template.category]
+        del self.search_corpus[template_id]
+        del self.json_cache[template_id]
+        self._version += 1
+        return True
+
+    def _add(self, template: Template) -> None:
+        self.index[template.id] = template
+        self.by_category.setdefault(template.category, {})[template.id] = template
+        self.search_corpus[template.id] = _search_text(template)
+        self.json_cache[template.id] = orjson.dumps(template)
+        self._version += 1
+
+
+class RedisTemplateStore:
+    """Redis 模板存储，多个工作进程或实例共享同一份数据
+
+    键布局：
+        tpl:body:{id}    模板 JSON 字节（ID 由客户端指定，单独的前缀避免与下列键冲突）
+        tpl:ids          有序集合，按写入时间排序的全部模板ID
+        tpl:cat:{分类}   有序集合，该分类下的模板ID
+        tpl:search       哈希，模板ID -> 小写化的搜索文本
+        tpl:version      数据版本号，每次写入或删除后递增
+        tpl:seeded       初始模板已写入的标记
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.redis = redis.Redis.from_url(url)
+
+    async def load(self, templates: List[Template]) -> None:
+        """写入初始模板，多个工作进程同时启动时只有一个会执行
+
+        种子数据与 tpl:seeded 标记在同一个事务中写入，写入失败时不会留下标记。
+        """
+
+        async def seed(pipe) -> None:
+            if await pipe.exists("tpl:seeded"):
+                return
+            pipe.multi()
+            for score, template in enumerate(templates):
+                self._queue_add(pipe, template, score)
+            pipe.set("tpl:seeded", 1)
+
+        await self.redis.transaction(seed, "tpl:seeded")
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    async def count(self) -> int:
+        return await self.redis.zcard("tpl:ids")
+
+    async def version(self) -> int:
+        return int(await self.redis.get("tpl:version") or 0)
+
+    async def get_json(self, template_id: str) -> Optional[bytes]:
+        return await self.redis.get(_body_key(template_id))
+
+    async def list_json(
+        self, category: Optional[str], skip: int, limit: int
+    ) -> List[bytes]:
+        if limit <= 0:
+            return []
+        key = f"tpl:cat:{category}" if category else "tpl:ids"
+        ids = await self.redis.zrange(key, skip, skip + limit - 1)
+        return await self._mget(ids)
+
+    async def search_json(self, q_lower: str, skip: int, limit: int) -> List[bytes]:
+        ids = await self.redis.zrange("tpl:ids", 0, -1)
+        if not ids:
+            return []
+        texts = await self.redis.hmget("tpl:search", ids)
+        matched = [
+            tid for tid, text in zip(ids, texts) if text and q_lower in text.decode()
+        ]
+        return await self._mget(matched[skip : skip + limit])
+
+    async def add(self, template: Template) -> bool:
+        """写入模板，ID 已存在时返回 False
+
+        模板与各索引在 WATCH/MULTI 事务中一并写入，与其他进程的写入或删除互不穿插。
+        """
+        key = _body_key(template.id)
+
+        async def insert(pipe) -> bool:
+            if await pipe.exists(key):
+                return False
+            pipe.multi()
+            self._queue_add(pipe, template, time.time())
+            return True
+
+        return await self.redis.transaction(insert, key, value_from_callable=True)
+
+    async def remove(self, template_id: str) -> bool:
+        """移除模板，不存在时返回 False（同样在 WATCH/MULTI 事务中执行）"""
+        key = _body_key(template_id)
+
+        async def delete(pipe) -> bool:
+            body = await pipe.get(key)
+            if body is None:
+                return False
+            category = orjson.loads(body).get("category") or ""
+            pipe.multi()
+            pipe.delete(key)
+            pipe.zrem("tpl:ids", template_id)
+            pipe.zrem(f"tpl:cat:{category}", template_id)
+            pipe.hdel("tpl:search", template_id)
+            pipe.incr("tpl:version")
+            return True
+
+        return await self.redis.transaction(delete, key, value_from_callable=True)
+
+    def _queue_add(self, pipe, template: Template, score: float) -> None:
+        pipe.set(_body_key(template.id), orjson.dumps(template))
+        pipe.zadd("tpl:ids", {template.id: score})
+        pipe.zadd(f"tpl:cat:{template.category or ''}", {template.id: score})
+        pipe.hset("tpl:search", template.id, _search_text(template))
+        pipe.incr("tpl:version")
+
+    async def _mget(self, ids: List[bytes]) -> List[bytes]:
+        if not ids:
+            return []
+        bodies = await self.redis.mget([_body_key(tid.decode()) for tid in ids])
+        # 列表读取与删除之间可能存在竞争，跳过已被删除的模板
+        return [body for body in bodies if body is not None]
+
+
+def _body_key(template_id: str) -> str:
+    """Redis 中模板 JSON 的键"""
+    return f"tpl:body:{template_id}"
+
+
+def _search_text(template: Template) -> str:
+    """预先小写化的搜索文本，字段间用 \x00 分隔以免跨字段误匹配"""
+    fields = (template.name, template.description, template.category or "")
+    return "\x00".join(fields).lower()
 
-# 全局状态
-mock_templates = generate_mock_templates()
+
+def _json_list_response(bodies: List[bytes]) -> Response:
+    """用预序列化的字节拼接模板列表响应"""
+    body = b"[" + b",".join(bodies) + b"]"
+    return Response(content=body, media_type="application/json")
+
+
+# 设置 REDIS_URL 时使用 Redis 存储（需要 pip install redis），否则使用进程内存储
+REDIS_URL = os.getenv("REDIS_URL")
+store = RedisTemplateStore(REDIS_URL) if REDIS_URL else MemoryTemplateStore()
+
+# 写操作锁：保证单进程内“检查 + 修改”整体原子，读操作无需加锁
+mutate_lock = asyncio.Lock()
+
+
+# 故障模拟（随机延迟和随机错误）默认关闭，避免人为延迟掩盖真实的性能瓶颈
+MOCK_CHAOS = os.getenv("MOCK_CHAOS") == "1"
+
+
+def _chaos_enabled(scope) -> bool:
+    """当前请求是否启用故障模拟"""
+    if MOCK_CHAOS:
+        return True
+    for name, value in scope.get("headers", ()):
+        if name == b"x-simulate-chaos":
+            return value == b"1"
+    return False
+
+
+# 当前时间戳缓存，由后台任务每秒刷新，避免每个请求调用 datetime.now().isoformat()
+_now_iso: str = datetime.now().isoformat()
+_NOW_ISO: bytes = _now_iso.encode()
+
+
+async def _tick_now_iso() -> None:
+    """每秒刷新一次时间戳缓存"""
+    global _now_iso, _NOW_ISO
+    while True:
+        await asyncio.sleep(1)
+        _now_iso = datetime.now().isoformat()
+        _NOW_ISO = _now_iso.encode()
 
 
 # ==================== 中间件 ====================
 
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """添加请求处理时间头"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+class ProcessTimeMiddleware:
+    """添加请求处理时间头
+
+    纯 ASGI 实现，只包装 send 注入响应头，避免 BaseHTTPMiddleware
+    为每个请求创建任务组和内存流的开销。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        chaos = _chaos_enabled(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # 模拟网络延迟（50-500ms），使用 asyncio.sleep 避免阻塞事件循环
+                if chaos:
+                    await asyncio.sleep(random.uniform(0.05, 0.5))
+                process_time = time.perf_counter() - start_time
+
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", str(process_time).encode()))
+                headers.append((b"x-server-name", b"Template Mock Server"))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ResponseCacheMiddleware:
+    """缓存模板查询类 GET 请求的响应
+
+    以 (路径, 查询参数) 为键缓存完整响应，命中时直接返回，不再进入路由和处理函数。
+    条目记录写入时的数据版本号，模板上传或删除后版本号变化，旧条目自动失效。
+    """
+
+    max_entries = 1024
+
+    def __init__(self, app):
+        self.app = app
+        self.cache: Dict[Tuple[str, bytes], Tuple[int, list, bytes]] = {}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith("/api/templates")
+            or _chaos_enabled(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
 
-    # 模拟网络延迟（50-500ms）
-    delay = random.uniform(0.05, 0.5)
-    time.sleep(delay)
+        key = (scope["path"], scope["query_string"])
+        version = await store.version()
 
-    response.headers["X-Process-Time"] = str(process_time + delay)
-    response.headers["X-Server-Name"] = "Template Mock Server"
-    return response
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] == version:
+            _, headers, body = entry
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        status_code = 0
+        headers: list = []
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message):
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                # 外层中间件会改写 headers，这里先保存一份副本
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if status_code == 200 and not message.get("more_body", False):
+                    if len(self.cache) >= self.max_entries:
+                        self.cache.clear()
+                    self.cache[key] = (version, headers, b"".join(chunks))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# 中间件按注册顺序由内向外包裹：缓存位于最内层，
+# 这样缓存命中的响应同样会经过 CORS 和计时头处理
+app.add_middleware(ResponseCacheMiddleware)
+
+# 启用 CORS：编辑器通过 Tauri 命令在 Rust 侧发起请求，并不依赖 CORS，
+# 因此生产/压测模式下默认关闭，省去每个请求经过的一层中间件
+ENABLE_CORS = os.getenv("ENABLE_CORS", "0" if PROD else "1") != "0"
+
+if ENABLE_CORS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # 允许所有来源，生产环境应限制
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+app.add_middleware(ProcessTimeMiddleware)
 
 
 # ==================== 健康检查 ====================
 
 
-@app.get("/", tags=["健康检查"])
-async def root():
-    """根路径，返回服务信息"""
-    return {
+# 根路径响应除时间戳外固定不变，启动时预先序列化（去掉结尾的 "}"，时间戳在请求时拼接）
+ROOT_BODY_PREFIX = orjson.dumps(
+    {
         "service": "Template Mock Server",
         "version": "1.0.0",
         "status": "running",
-        "timestamp": datetime.now().isoformat(),
         "endpoints": {
             "templates": "/api/templates",
             "template_by_id": "/api/templates/{id}",
@@ -176,27 +547,48 @@ async def root():
             "health": "/health",
         },
     }
+)[:-1]
+
+
+@app.get("/", tags=["健康检查"])
+async def root():
+    """根路径，返回服务信息"""
+    body = ROOT_BODY_PREFIX + b',"timestamp":"' + _NOW_ISO + b'"}'
+    return Response(content=body, media_type="application/json")
+
+
+@lru_cache(maxsize=1)
+def _health_body(timestamp: str, template_count: int) -> bytes:
+    """生成健康检查响应体，时间戳和模板数量不变时复用"""
+    return orjson.dumps(
+        {
+            "status": "healthy",
+            "timestamp": timestamp,
+            "template_count": template_count,
+        }
+    )
 
 
 @app.get("/health", tags=["健康检查"])
 async def health_check():
     """健康检查端点"""
-    return JSONResponse(
+    return Response(
+        content=_health_body(_now_iso, await store.count()),
         status_code=status.HTTP_200_OK,
-        content={
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "template_count": len(mock_templates),
-        },
+        media_type="application/json",
     )
 
 
 # ==================== 模板 API ====================
 
 
-@app.get("/api/templates", response_model=List[Template], tags=["模板管理"])
+# 模板接口直接返回预序列化结果，模型仅用于 OpenAPI 文档，避免逐条重复校验
+TEMPLATE_LIST_RESPONSES = {200: {"model": List[Template]}}
+
+
+@app.get("/api/templates", responses=TEMPLATE_LIST_RESPONSES, tags=["模板管理"])
 async def get_templates(
-    skip: int = 0, limit: int = 100, category: Optional[str] = None
+    request: Request, skip: int = 0, limit: int = 100, category: Optional[str] = None
 ):
     """
     获取模板列表
@@ -205,39 +597,42 @@ async def get_templates(
     - **limit**: 返回多少条记录（分页）
     - **category**: 按分类过滤
     """
-    # 按分类过滤
-    filtered_templates = mock_templates
-    if category:
-        filtered_templates = [t for t in mock_templates if t.category == category]
-
-    # 分页
-    result = filtered_templates[skip : skip + limit]
+    # islice 不接受负数，先修正分页参数
+    skip, limit = max(skip, 0), max(limit, 0)
+    bodies = await store.list_json(category, skip, limit)
 
-    # 随机模拟一些错误（10%概率）
-    if random.random() < 0.1:
+    # 启用故障模拟时随机返回错误（10%概率）
+    if _chaos_enabled(request.scope) and random.random() < 0.1:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="模拟服务器错误：数据库连接失败",
         )
 
-    return result
+    return _json_list_response(bodies)
 
 
-@app.get("/api/templates/{template_id}", response_model=Template, tags=["模板管理"])
+@app.get(
+    "/api/templates/{template_id}",
+    responses={200: {"model": Template}},
+    tags=["模板管理"],
+)
 async def get_template_by_id(template_id: str):
     """
     根据ID获取模板详情
     """
-    for template in mock_templates:
-        if template.id == template_id:
-            return template
+    body = await store.get_json(template_id)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"模板 '{template_id}' 不存在",
+        )
 
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND, detail=f"模板 '{template_id}' 不存在"
-    )
+    return Response(content=body, media_type="application/json")
 
 
-@app.post("/api/templates/search", response_model=List[Template], tags=["模板管理"])
+@app.post(
+    "/api/templates/search", responses=TEMPLATE_LIST_RESPONSES, tags=["模板管理"]
+)
 async def search_templates(q: str, skip: int = 0, limit: int = 50):
     """
     搜索模板
@@ -251,36 +646,20 @@ async def search_templates(q: str, skip: int = 0, limit: int = 50):
             status_code=status.HTTP_400_BAD_REQUEST, detail="搜索关键词至少需要2个字符"
         )
 
-    q_lower = q.lower()
-    results = []
-
-    for template in mock_templates:
-        if (
-            q_lower in template.name.lower()
-            or q_lower in template.description.lower()
-            or q_lower in template.category.lower()
-        ):
-            results.append(template)
+    # 搜索并分页
+    bodies = await store.search_json(q.lower(), max(skip, 0), max(limit, 0))
+    return _json_list_response(bodies)
 
-    # 分页
-    return results[skip : skip + limit]
 
-
-@app.post("/api/templates/upload", response_model=ApiResponse, tags=["模板管理"])
+@app.post(
+    "/api/templates/upload", responses={200: {"model": ApiResponse}}, tags=["模板管理"]
+)
 async def upload_template(template: TemplateUpload, request: Request):
     """
     上传新模板
 
     - **template**: 模板数据
     """
-    # 检查模板是否已存在
-    for existing in mock_templates:
-        if existing.id == template.id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"模板ID '{template.id}' 已存在",
-            )
-
     # 创建新模板
     new_template = Template(
         id=template.id,
@@ -288,22 +667,33 @@ async def upload_template(template: TemplateUpload, request: Request):
         description=template.description,
         content=template.content,
         category="user_uploaded",
-        created_at=datetime.now().isoformat(),
-        updated_at=datetime.now().isoformat(),
+        created_at=_now_iso,
+        updated_at=_now_iso,
     )
 
-    mock_templates.append(new_template)
+    # 写入模板，ID 已存在时返回冲突
+    async with mutate_lock:
+        added = await store.add(new_template)
+
+    if not added:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"模板ID '{template.id}' 已存在",
+        )
 
-    return ApiResponse(
+    response = ApiResponse(
         success=True,
         message=f"模板 '{template.name}' 上传成功",
         data={"template_id": template.id},
-        timestamp=datetime.now().isoformat(),
+        timestamp=_now_iso,
     )
+    return ORJSONResponse(response)
 
 
 @app.delete(
-    "/api/templates/{template_id}", response_model=ApiResponse, tags=["模板管理"]
+    "/api/templates/{template_id}",
+    responses={200: {"model": ApiResponse}},
+    tags=["模板管理"],
 )
 async def delete_template(template_id: str):
     """
@@ -311,41 +701,42 @@ async def delete_template(template_id: str):
 
     - **template_id**: 模板ID
     """
-    global mock_templates
-
-    original_count = len(mock_templates)
-    mock_templates = [t for t in mock_templates if t.id != template_id]
+    async with mutate_lock:
+        removed = await store.remove(template_id)
 
-    if len(mock_templates) == original_count:
+    if not removed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"模板 '{template_id}' 不存在"
         )
 
-    return ApiResponse(
+    response = ApiResponse(
         success=True,
         message=f"模板 '{template_id}' 删除成功",
-        timestamp=datetime.now().isoformat(),
+        timestamp=_now_iso,
     )
+    return ORJSONResponse(response)
 
 
 # ==================== 测试端点 ====================
 
 
+# 成功响应同样只有时间戳会变化，预先序列化其余部分
+TEST_SUCCESS_BODY_PREFIX = orjson.dumps(
+    {"status": "success", "message": "请求成功", "data": {"test": "value"}}
+)[:-1]
+
+
 @app.get("/api/test/success", tags=["测试"])
 async def test_success():
     """测试成功响应"""
-    return {
-        "status": "success",
-        "message": "请求成功",
-        "data": {"test": "value"},
-        "timestamp": datetime.now().isoformat(),
-    }
+    body = TEST_SUCCESS_BODY_PREFIX + b',"timestamp":"' + _NOW_ISO + b'"}'
+    return Response(content=body, media_type="application/json")
 
 
-@app.get("/api/test/error/{status_code}", tags=["测试"])
-async def test_error(status_code: int = 500):
-    """测试错误响应"""
-    error_messages = {
+# 常见错误码的异常对象预先创建，请求时直接复用
+TEST_ERRORS = {
+    code: HTTPException(status_code=code, detail=message)
+    for code, message in {
         400: "错误的请求",
         401: "未授权",
         403: "禁止访问",
@@ -353,11 +744,19 @@ async def test_error(status_code: int = 500):
         500: "服务器内部错误",
         502: "网关错误",
         503: "服务不可用",
-    }
+    }.items()
+}
+
 
-    message = error_messages.get(status_code, f"HTTP {status_code} 错误")
+@app.get("/api/test/error/{status_code}", tags=["测试"])
+async def test_error(status_code: int = 500):
+    """测试错误响应"""
+    error = TEST_ERRORS.get(status_code)
+    if error is None:
+        raise HTTPException(status_code=status_code, detail=f"HTTP {status_code} 错误")
 
-    raise HTTPException(status_code=status_code, detail=message)
+    # 清除上次抛出时留下的 traceback，避免复用的异常对象不断累积栈帧
+    raise error.with_traceback(None)
 
 
 @app.get("/api/test/delay/{seconds}", tags=["测试"])
@@ -368,13 +767,13 @@ async def test_delay(seconds: float = 1.0):
             status_code=status.HTTP_400_BAD_REQUEST, detail="延迟时间不能超过10秒"
         )
 
-    time.sleep(seconds)
+    await asyncio.sleep(seconds)
 
     return {
         "status": "success",
         "message": f"延迟 {seconds} 秒后响应",
         "delay_seconds": seconds,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso,
     }
 
 
@@ -387,7 +786,8 @@ if __name__ == "__main__":
     print("模板服务模拟器")
     print("=" * 60)
     print(f"服务地址: http://localhost:8000")
-    print(f"API文档: http://localhost:8000/docs")
+    if not PROD:
+        print(f"API文档: http://localhost:8000/docs")
     print(f"模板列表: http://localhost:8000/api/templates")
     print(f"健康检查: http://localhost:8000/health")
     print("=" * 60)
@@ -399,4 +799,18 @@ if __name__ == "__main__":
     print("  DELETE /api/templates/{id}    - 删除模板")
     print("=" * 60)
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # 使用 Redis 存储时各进程共享数据，默认按 CPU 核数启动工作进程
+    workers = int(os.getenv("WORKERS", "0" if REDIS_URL else "1"))
+    workers = workers or os.cpu_count() or 1
+
+    # 多进程模式下 uvicorn 需要以导入字符串的形式加载应用
+    uvicorn.run(
+        "template_server:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="auto",  # 已安装 uvloop 时优先使用（Windows 下回退到 asyncio）
+        http="auto",  # 已安装 httptools 时优先使用 C 实现的解析器
+        access_log=not PROD,
+        log_level="warning" if PROD else "info",
+    )